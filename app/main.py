@@ -14,13 +14,88 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import streamlit as st
 import numpy as np
-import trimesh
-import plotly.graph_objects as go
-from io import BytesIO
 
-from core.tpms import Gyroid, SchwarzP
-from geometry.marching_cubes import generate_mesh
-from geometry.industrial import analyze_geometry
+# The geometry stack (trimesh, plotly, the core and geometry packages) is
+# imported inside the helpers below, so the page and sidebar render before
+# those heavy modules load
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _build_mesh(primitive_type: str, scale: float, thickness: float,
+                resolution: int, iso_value: float, bounds: tuple):
+    """Generate a mesh and return its (vertices, faces) arrays, cached per parameter set."""
+    from core.tpms import Gyroid, SchwarzP
+    from geometry.marching_cubes import generate_mesh
+    
+    if primitive_type == "Gyroid TPMS":
+        field = Gyroid(scale=scale, thickness=thickness)
+    else:  # Schwarz P TPMS
+        field = SchwarzP(scale=scale, thickness=thickness)
+    
+    mesh = generate_mesh(
+        field,
+        resolution=resolution,
+        iso_value=iso_value,
+        bounds=bounds
+    )
+    
+    # Compact arrays keep the cache and session state small
+    return mesh.vertices.astype(np.float32), mesh.faces.astype(np.int32)
+
+
+def _to_trimesh(vertices: np.ndarray, faces: np.ndarray):
+    """Rebuild a Trimesh from stored arrays, skipping re-processing of clean output."""
+    import trimesh
+    
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _analyze_mesh(vertices: np.ndarray, faces: np.ndarray) -> dict:
+    """Run the industrial analysis on a mesh given as arrays, cached per mesh."""
+    from geometry.industrial import analyze_geometry
+    
+    return analyze_geometry(_to_trimesh(vertices, faces))
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _make_figure(vertices: np.ndarray, faces: np.ndarray):
+    """Build the Plotly figure for a mesh, cached per mesh."""
+    import plotly.graph_objects as go
+    
+    # One transposed copy gives contiguous, compactly typed columns, which
+    # Plotly ships as binary buffers instead of JSON lists of floats
+    x, y, z = np.ascontiguousarray(vertices.T, dtype=np.float32)
+    i, j, k = np.ascontiguousarray(faces.T, dtype=np.int32)
+    
+    fig = go.Figure(data=[
+        go.Mesh3d(
+            x=x,
+            y=y,
+            z=z,
+            i=i,
+            j=j,
+            k=k,
+            colorscale='Viridis',
+            intensity=z,
+            showscale=True,
+            name='Geometry'
+        )
+    ])
+    
+    fig.update_layout(
+        scene=dict(
+            xaxis_title="X",
+            yaxis_title="Y",
+            zaxis_title="Z",
+            aspectmode='data'
+        ),
+        height=600,
+        title="Interactive 3D Geometry"
+    )
+    
+    return fig
+
 
 # Page configuration
 st.set_page_config(
@@ -115,70 +190,49 @@ bounds = (bounds_x, bounds_y, bounds_z)
 # Generate button
 generate_button = st.sidebar.button("🚀 Generate Geometry", type="primary")
 
+# Fingerprint of the current parameters; pressing Generate again without
+# changing anything keeps the existing mesh
+cfg_hash = hash((primitive_type, scale, thickness, resolution, iso_value, bounds))
+needs_mesh = 'mesh_arrays' not in st.session_state or (
+    generate_button and cfg_hash != st.session_state.get('cfg_hash')
+)
+
 # Main content area
 col1, col2 = st.columns([2, 1])
 
 with col1:
     st.subheader("3D Visualization")
     
-    if generate_button or 'mesh' not in st.session_state:
+    if needs_mesh:
         with st.spinner("Generating geometry..."):
-            # Create field based on selection
-            if primitive_type == "Gyroid TPMS":
-                field = Gyroid(scale=scale, thickness=thickness)
-            else:  # Schwarz P TPMS
-                field = SchwarzP(scale=scale, thickness=thickness)
-            
-            # Generate mesh
+            # Generate mesh (repeat parameter sets are served from the cache)
             try:
-                mesh = generate_mesh(
-                    field,
-                    resolution=resolution,
-                    iso_value=iso_value,
-                    bounds=bounds
+                vertices, faces = _build_mesh(
+                    primitive_type, scale, thickness, resolution, iso_value, bounds
                 )
                 
-                if len(mesh.vertices) > 0:
-                    st.session_state['mesh'] = mesh
+                if len(vertices) > 0:
+                    # Store plain arrays; a Trimesh with its caches is far
+                    # heavier to carry across reruns
+                    st.session_state['mesh_arrays'] = (vertices, faces)
                     st.session_state['field'] = primitive_type
+                    st.session_state['cfg_hash'] = cfg_hash
                     st.success("✅ Geometry generated successfully!")
                 else:
                     st.error("❌ Generated mesh is empty. Try adjusting parameters.")
-                    st.session_state['mesh'] = None
+                    st.session_state['mesh_arrays'] = None
+                    st.session_state['cfg_hash'] = None
             except Exception as e:
                 st.error(f"❌ Error generating geometry: {str(e)}")
-                st.session_state['mesh'] = None
+                st.session_state['mesh_arrays'] = None
+                st.session_state['cfg_hash'] = None
     
     # Visualize mesh
-    if 'mesh' in st.session_state and st.session_state['mesh'] is not None:
-        mesh = st.session_state['mesh']
+    if st.session_state.get('mesh_arrays') is not None:
+        vertices, faces = st.session_state['mesh_arrays']
         
-        # Create 3D plot
-        fig = go.Figure(data=[
-            go.Mesh3d(
-                x=mesh.vertices[:, 0],
-                y=mesh.vertices[:, 1],
-                z=mesh.vertices[:, 2],
-                i=mesh.faces[:, 0],
-                j=mesh.faces[:, 1],
-                k=mesh.faces[:, 2],
-                colorscale='Viridis',
-                intensity=mesh.vertices[:, 2],
-                showscale=True,
-                name='Geometry'
-            )
-        ])
-        
-        fig.update_layout(
-            scene=dict(
-                xaxis_title="X",
-                yaxis_title="Y",
-                zaxis_title="Z",
-                aspectmode='data'
-            ),
-            height=600,
-            title="Interactive 3D Geometry"
-        )
+        # Create 3D plot (reused across reruns while the mesh is unchanged)
+        fig = _make_figure(vertices, faces)
         
         st.plotly_chart(fig, use_container_width=True)
     else:
@@ -187,9 +241,9 @@ with col1:
 with col2:
     st.subheader("📊 Analysis")
     
-    if 'mesh' in st.session_state and st.session_state['mesh'] is not None:
-        mesh = st.session_state['mesh']
-        analysis = analyze_geometry(mesh)
+    if st.session_state.get('mesh_arrays') is not None:
+        vertices, faces = st.session_state['mesh_arrays']
+        analysis = _analyze_mesh(vertices, faces)
         
         st.metric("Volume", f"{analysis['volume']:.2f} mm³")
         st.metric("Surface Area", f"{analysis['surface_area']:.2f} mm²")
@@ -213,18 +267,16 @@ with col2:
         st.subheader("💾 Export")
         
         if st.button("Download STL"):
-            if mesh is not None:
-                # Export to bytes
-                buffer = BytesIO()
-                mesh.export(buffer, file_type='stl')
-                buffer.seek(0)
-                
-                st.download_button(
-                    label="⬇️ Download STL File",
-                    data=buffer,
-                    file_name=f"{primitive_type.lower().replace(' ', '_')}_{scale}_{resolution}.stl",
-                    mime="application/octet-stream"
-                )
+            # Export straight to binary STL bytes (the Trimesh is only rebuilt on demand)
+            from trimesh.exchange.stl import export_stl
+            stl_data = export_stl(_to_trimesh(vertices, faces))
+            
+            st.download_button(
+                label="⬇️ Download STL File",
+                data=stl_data,
+                file_name=f"{primitive_type.lower().replace(' ', '_')}_{scale}_{resolution}.stl",
+                mime="application/octet-stream"
+            )
     else:
         st.info("Generate a geometry to see analysis results.")
 
@@ -8,7 +8,82 @@ mathematical functions f(x, y, z) -> R that map 3D coordinates to real values.
 
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Union, Tuple
+from typing import Union, Tuple, Type, Optional
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+
+# Working-set budget for one block of generic grid evaluation, sized so the
+# block and its temporaries stay resident in a typical per-core L2 cache
+_BLOCK_BYTES = 512 * 1024
+
+# Rough number of block-sized temporaries a field expression allocates
+_BLOCK_TEMPORARIES = 6
+
+
+# Marker for parameter values that cannot be part of a cache key
+_UNKEYABLE = object()
+
+# Immutable scalar types that may enter a cache key as they are
+_KEY_SCALARS = (type(None), bool, int, float, complex, str, bytes, np.generic, np.dtype)
+
+
+def _key_value(value):
+    """Return the cache-key form of a field parameter, or _UNKEYABLE."""
+    if isinstance(value, _KEY_SCALARS):
+        return value
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return _UNKEYABLE
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, ScalarField):
+        key = value._cache_key()
+        return _UNKEYABLE if key is None else key
+    if isinstance(value, tuple):
+        items = tuple(_key_value(item) for item in value)
+        return _UNKEYABLE if any(item is _UNKEYABLE for item in items) else items
+    return _UNKEYABLE
+
+
+def get_array_module(*arrays):
+    """Return the array module (NumPy, or CuPy for GPU arrays) owning `arrays`."""
+    if cupy is not None:
+        return cupy.get_array_module(*arrays)
+    return np
+
+
+def _device_module(device: str):
+    """Resolve an evaluation device ('cpu', 'gpu' or 'auto') to its array module."""
+    if device not in ('cpu', 'gpu', 'auto'):
+        raise ValueError(f"Unknown device '{device}', expected 'cpu', 'gpu' or 'auto'")
+    if device == 'cpu' or cupy is None:
+        if device == 'gpu':
+            raise RuntimeError("device='gpu' requires CuPy to be installed")
+        return np
+    
+    try:
+        has_gpu = cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        has_gpu = False
+    
+    if device == 'gpu' and not has_gpu:
+        raise RuntimeError("device='gpu' requested but no CUDA device is available")
+    return cupy if has_gpu else np
+
+
+def _grid_axes(xp, x_range: Tuple[float, float],
+               y_range: Tuple[float, float],
+               z_range: Tuple[float, float],
+               resolution: int, dtype):
+    """Build the three 1D axes of a regular grid with one open-grid call."""
+    step = resolution * 1j
+    axes = xp.ogrid[x_range[0]:x_range[1]:step,
+                    y_range[0]:y_range[1]:step,
+                    z_range[0]:z_range[1]:step]
+    return tuple(axis.ravel().astype(dtype, copy=False) for axis in axes)
 
 
 class ScalarField(ABC):
@@ -27,6 +102,23 @@ class ScalarField(ABC):
         Scaling factor for the field (default: 1.0)
     offset : tuple of float
         Translation offset (x, y, z) for the field (default: (0, 0, 0))
+    dtype : np.dtype
+        Floating point type used for grid evaluation (default: float32).
+        Single precision halves memory traffic and is far more accurate
+        than iso-surface extraction requires. Point evaluation through
+        `__call__` keeps the precision of its inputs.
+    
+    Notes
+    -----
+    Grid volumes returned by `evaluate_separable` and `evaluate_grid_values`
+    are C-ordered arrays of the field's dtype, indexed [i, j, k] along X, Y
+    and Z, so Z varies fastest in memory. This matches the inner loop of
+    marching cubes, which can then stream through the volume contiguously.
+    
+    Array results of `evaluate`, `evaluate_separable` and
+    `evaluate_grid_values` are fresh buffers owned by the caller, never
+    views of the input coordinates, so implementations may finish them in
+    place (the TPMS fields apply their thickness offset this way).
     
     Examples
     --------
@@ -37,7 +129,8 @@ class ScalarField(ABC):
     >>> value = field(1.0, 2.0, 3.0)
     """
     
-    def __init__(self, scale: float = 1.0, offset: Tuple[float, float, float] = (0.0, 0.0, 0.0)):
+    def __init__(self, scale: float = 1.0, offset: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+                 dtype: Type[np.floating] = np.float32):
         """
         Initialize a scalar field.
         
@@ -47,10 +140,36 @@ class ScalarField(ABC):
             Scaling factor for the field coordinates, by default 1.0
         offset : tuple of float, optional
             Translation offset (x, y, z), by default (0.0, 0.0, 0.0)
+        dtype : np.dtype, optional
+            Floating point type for grid evaluation, by default np.float32
         """
         self.scale = scale
+        self.dtype = np.dtype(dtype)
+        # Kept in double precision; the dtype only applies to grid axes
         self.offset = np.array(offset, dtype=np.float64)
     
+    def _cache_key(self) -> Optional[tuple]:
+        """
+        Return a hashable fingerprint of the field's parameters, or None.
+        
+        The key covers the field's class and all of its instance attributes,
+        so two fields with equal keys sample to identical grids. Only value
+        types enter the key: numbers, strings, dtypes, arrays, tuples of
+        these and nested fields (through their own keys). Any other
+        attribute, such as a callable or a plain object that hashes by
+        identity and could change without changing the key, makes the key
+        None, which disables grid caching for the field. Subclasses whose
+        values depend on anything besides their attributes should override
+        this to return None.
+        """
+        items = []
+        for name, value in sorted(vars(self).items()):
+            value = _key_value(value)
+            if value is _UNKEYABLE:
+                return None
+            items.append((name, value))
+        return (type(self), tuple(items))
+    
     @abstractmethod
     def evaluate(self, x: Union[float, np.ndarray], 
                  y: Union[float, np.ndarray], 
@@ -97,20 +216,129 @@ class ScalarField(ABC):
         float or np.ndarray
             Scalar field value(s) at the transformed coordinates
         """
-        # Apply scaling and offset
-        x_scaled = x * self.scale + self.offset[0]
-        y_scaled = y * self.scale + self.offset[1]
-        z_scaled = z * self.scale + self.offset[2]
+        # Apply scaling and offset; the inputs decide the precision
+        ox, oy, oz = self.offset.tolist()
+        x_scaled = x * self.scale + ox
+        y_scaled = y * self.scale + oy
+        z_scaled = z * self.scale + oz
         
         return self.evaluate(x_scaled, y_scaled, z_scaled)
     
+    def evaluate_separable(self, x: np.ndarray,
+                           y: np.ndarray,
+                           z: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the scalar field on the grid spanned by three 1D axes.
+        
+        The default implementation allocates the output volume once and
+        fills it block by block, broadcasting the axis slices of each block
+        so the temporaries of the field expression stay cache-sized.
+        Subclasses whose equation
+        separates per axis (such as the TPMS surfaces) override this to
+        compute transcendental functions once per axis sample instead of
+        once per grid point.
+        
+        Parameters
+        ----------
+        x : np.ndarray
+            1D array of X coordinates
+        y : np.ndarray
+            1D array of Y coordinates
+        z : np.ndarray
+            1D array of Z coordinates
+        
+        Returns
+        -------
+        np.ndarray
+            (len(x), len(y), len(z)) array of scalar field values
+        """
+        shape = (len(x), len(y), len(z))
+        
+        # Blocks span whole rows along Z and as many (i, j) rows as fit the budget
+        xp = get_array_module(x, y, z)
+        dtype = np.result_type(x.dtype, y.dtype, z.dtype, 0.0)
+        itemsize = dtype.itemsize
+        rows = max(1, _BLOCK_BYTES // (_BLOCK_TEMPORARIES * itemsize * max(1, shape[2])))
+        block_j = min(shape[1], rows)
+        block_i = max(1, rows // max(1, shape[1]))
+        
+        values = None
+        for i0 in range(0, shape[0], block_i):
+            for j0 in range(0, shape[1], block_j):
+                # Broadcast the axis slices instead of materialising X, Y, Z
+                block = self(x[i0:i0 + block_i, None, None],
+                             y[None, j0:j0 + block_j, None],
+                             z[None, None, :])
+                if values is None:
+                    values = xp.empty(shape, dtype=getattr(block, 'dtype', dtype))
+                values[i0:i0 + block_i, j0:j0 + block_j] = block
+        
+        if values is None:
+            # Empty grid: nothing was evaluated
+            values = xp.empty(shape, dtype=dtype)
+        
+        return values
+    
+    def evaluate_grid_values(self, x_range: Tuple[float, float],
+                             y_range: Tuple[float, float],
+                             z_range: Tuple[float, float],
+                             resolution: int,
+                             device: str = 'cpu') -> np.ndarray:
+        """
+        Evaluate the scalar field on a regular 3D grid, returning only values.
+        
+        This is the path to use when the sample coordinates are implied by
+        the ranges and resolution (e.g. for marching cubes), as it never
+        materialises the (N^3, 3) coordinate list.
+        
+        Parameters
+        ----------
+        x_range : tuple of float
+            (x_min, x_max) range for X coordinates
+        y_range : tuple of float
+            (y_min, y_max) range for Y coordinates
+        z_range : tuple of float
+            (z_min, z_max) range for Z coordinates
+        resolution : int
+            Number of points along each axis
+        device : {'cpu', 'gpu', 'auto'}, optional
+            Where to evaluate the field, by default 'cpu'. 'gpu' evaluates
+            with CuPy on a CUDA device and copies only the final values back
+            to the host; 'auto' uses the GPU when CuPy and a device are
+            available.
+        
+        Returns
+        -------
+        np.ndarray
+            C-contiguous (resolution, resolution, resolution) array of
+            scalar field values in the field's dtype, indexed as [i, j, k]
+            along X, Y and Z
+        """
+        xp = _device_module(device)
+        axes = _grid_axes(xp, x_range, y_range, z_range, resolution, self.dtype)
+        return self._evaluate_axes(xp, axes)
+    
+    def _evaluate_axes(self, xp, axes) -> np.ndarray:
+        """Evaluate the grid spanned by `axes` into a C-ordered host volume."""
+        values = self.evaluate_separable(*axes)
+        if xp is not np:
+            values = cupy.asnumpy(values)
+        
+        # Guarantee the documented layout even for custom evaluate_separable
+        # overrides; this is free for the built-in paths
+        return np.ascontiguousarray(values, dtype=self.dtype)
+    
     def evaluate_grid(self, x_range: Tuple[float, float], 
                      y_range: Tuple[float, float],
                      z_range: Tuple[float, float],
-                     resolution: int) -> Tuple[np.ndarray, np.ndarray]:
+                     resolution: int,
+                     device: str = 'cpu') -> Tuple[np.ndarray, np.ndarray]:
         """
         Evaluate the scalar field on a regular 3D grid.
         
+        Use `evaluate_grid_values` instead when the coordinates are not
+        needed.
+        
         Parameters
         ----------
         x_range : tuple of float
@@ -121,6 +349,8 @@ class ScalarField(ABC):
             (z_min, z_max) range for Z coordinates
         resolution : int
             Number of points along each axis
+        device : {'cpu', 'gpu', 'auto'}, optional
+            Where to evaluate the field, by default 'cpu'
         
         Returns
         -------
@@ -129,13 +359,16 @@ class ScalarField(ABC):
             - coordinates: (N, 3) array of (x, y, z) points
             - values: (N,) array of scalar field values
         """
-        x = np.linspace(x_range[0], x_range[1], resolution)
-        y = np.linspace(y_range[0], y_range[1], resolution)
-        z = np.linspace(z_range[0], z_range[1], resolution)
-        
-        X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
-        coords = np.stack([X.ravel(), Y.ravel(), Z.ravel()], axis=1)
+        # Build the axes once for both the values and the coordinates
+        xp = _device_module(device)
+        axes = _grid_axes(xp, x_range, y_range, z_range, resolution, self.dtype)
+        values = self._evaluate_axes(xp, axes).ravel()
+        x, y, z = axes if xp is np else (cupy.asnumpy(axis) for axis in axes)
         
-        values = self(X.ravel(), Y.ravel(), Z.ravel())
+        # Fill the stacked point list in place, without meshgrid temporaries
+        coords = np.empty((resolution, resolution, resolution, 3), dtype=values.dtype)
+        coords[..., 0] = x[:, None, None]
+        coords[..., 1] = y[None, :, None]
+        coords[..., 2] = z[None, None, :]
         
-        return coords, values
+        return coords.reshape(-1, 3), values
@@ -0,0 +1,121 @@
+"""
+JIT-Compiled TPMS Kernels
+Created by Jaime Estela | https://github.com/Jaimeestela | studio@jaimeestela.com
+
+This module provides optional Numba-compiled kernels for the TPMS surfaces.
+The point kernels fuse the coordinate transform (scale and offset), the
+surface equation and the thickness offset into a single parallel pass that
+writes directly into a preallocated output buffer, instead of streaming a
+dozen temporary arrays through memory. The grid kernels assemble a whole
+volume from per-axis trig tables, spreading the N^3 pass across all cores.
+
+The kernels are compiled eagerly for float32 and float64 inputs when this
+module is imported, and cached on disk, so later imports load the compiled
+machine code instead of paying the JIT warm-up on the first evaluation.
+
+Numba is an optional dependency. When it is not installed, NUMBA_AVAILABLE
+is False and the TPMS classes fall back to their NumPy implementation.
+"""
+
+import math
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+# Floating point types the kernels are compiled for
+KERNEL_DTYPES = ('float32', 'float64')
+
+# Below this many points, waking the thread pool costs more than the
+# parallel loop saves, so point evaluation uses the serial specialisation
+PARALLEL_THRESHOLD = 16384
+
+# (x, y, z, scale, ox, oy, oz, thickness, out) over flat contiguous arrays
+_POINT_SIGNATURES = [
+    f'void({t}[::1], {t}[::1], {t}[::1], f8, f8, f8, f8, f8, {t}[::1])'
+    for t in KERNEL_DTYPES
+]
+
+# (sx, cx, sy, cy, sz, cz, thickness, out) from 1D trig tables into a C-order volume
+_GYROID_GRID_SIGNATURES = [
+    f'void({t}[::1], {t}[::1], {t}[::1], {t}[::1], {t}[::1], {t}[::1], f8, {t}[:, :, ::1])'
+    for t in KERNEL_DTYPES
+]
+
+# (cx, cy, cz, thickness, out) from 1D trig tables into a C-order volume
+_SCHWARZ_P_GRID_SIGNATURES = [
+    f'void({t}[::1], {t}[::1], {t}[::1], f8, {t}[:, :, ::1])'
+    for t in KERNEL_DTYPES
+]
+
+
+def _gyroid_points(x, y, z, scale, ox, oy, oz, thickness, out):
+    """Evaluate the Gyroid at flat point arrays, writing into `out`."""
+    for i in prange(x.shape[0]):
+        xs = x[i] * scale + ox
+        ys = y[i] * scale + oy
+        zs = z[i] * scale + oz
+        value = (math.sin(xs) * math.cos(ys) +
+                 math.sin(ys) * math.cos(zs) +
+                 math.sin(zs) * math.cos(xs))
+        if thickness > 0.0:
+            value = abs(value) - thickness
+        out[i] = value
+
+
+def _schwarz_p_points(x, y, z, scale, ox, oy, oz, thickness, out):
+    """Evaluate the Schwarz P surface at flat point arrays, writing into `out`."""
+    for i in prange(x.shape[0]):
+        value = (math.cos(x[i] * scale + ox) +
+                 math.cos(y[i] * scale + oy) +
+                 math.cos(z[i] * scale + oz))
+        if thickness > 0.0:
+            value = abs(value) - thickness
+        out[i] = value
+
+
+def _gyroid_grid(sx, cx, sy, cy, sz, cz, thickness, out):
+    """Assemble a Gyroid volume from per-axis sin/cos tables, writing into `out`."""
+    for i in prange(out.shape[0]):
+        for j in range(out.shape[1]):
+            a = sx[i] * cy[j]
+            for k in range(out.shape[2]):
+                value = a + sy[j] * cz[k] + sz[k] * cx[i]
+                if thickness > 0.0:
+                    value = abs(value) - thickness
+                out[i, j, k] = value
+
+
+def _schwarz_p_grid(cx, cy, cz, thickness, out):
+    """Assemble a Schwarz P volume from per-axis cos tables, writing into `out`."""
+    for i in prange(out.shape[0]):
+        for j in range(out.shape[1]):
+            a = cx[i] + cy[j]
+            for k in range(out.shape[2]):
+                value = a + cz[k]
+                if thickness > 0.0:
+                    value = abs(value) - thickness
+                out[i, j, k] = value
+
+
+if NUMBA_AVAILABLE:
+    _compile_points = njit(_POINT_SIGNATURES, parallel=True, fastmath=True, cache=True)
+    _compile_points_serial = njit(_POINT_SIGNATURES, fastmath=True, cache=True)
+    gyroid_points = _compile_points(_gyroid_points)
+    schwarz_p_points = _compile_points(_schwarz_p_points)
+    gyroid_points_serial = _compile_points_serial(_gyroid_points)
+    schwarz_p_points_serial = _compile_points_serial(_schwarz_p_points)
+    gyroid_grid = njit(_GYROID_GRID_SIGNATURES, parallel=True, fastmath=True,
+                       cache=True)(_gyroid_grid)
+    schwarz_p_grid = njit(_SCHWARZ_P_GRID_SIGNATURES, parallel=True, fastmath=True,
+                          cache=True)(_schwarz_p_grid)
+else:
+    gyroid_points = None
+    schwarz_p_points = None
+    gyroid_points_serial = None
+    schwarz_p_points_serial = None
+    gyroid_grid = None
+    schwarz_p_grid = None
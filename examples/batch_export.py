@@ -3,21 +3,119 @@ Batch Export Example
 Created by Jaime Estela | https://github.com/Jaimeestela | studio@jaimeestela.com
 
 This example demonstrates how to generate multiple geometries with varying
-parameters and export them in batch for parametric design workflows.
+parameters and export them in batch for parametric design workflows. Each
+variation is independent, so the batches run in parallel worker processes.
 """
 
 import sys
 import os
-import numpy as np
+import multiprocessing
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.tpms import Gyroid, SchwarzP
+from core.tpms import Gyroid
 from geometry.marching_cubes import generate_mesh
 from geometry.industrial import analyze_geometry, estimate_material_usage
 
 
+def _init_worker():
+    """Run each worker's compiled kernels on a single thread."""
+    # The pool already spreads the jobs over the cores; letting every worker
+    # start its own Numba threads (and extraction slabs) would oversubscribe
+    # the machine once per worker
+    try:
+        import numba
+    except ImportError:
+        return
+    numba.set_num_threads(1)
+
+
+def _run_parallel(job, params):
+    """
+    Run `job` over `params` in a process pool.
+    
+    Every mesh is independent, so each one is generated, analyzed and
+    exported in its own worker process. Results are yielded as soon as
+    each worker finishes, so reporting overlaps with the remaining work.
+    
+    Workers are spawned rather than forked: this process has already
+    started Numba's threading layer, which is not safe to fork.
+    """
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(job, params)
+
+
+def _gyroid_scale_job(scale):
+    """Generate, analyze and export one Gyroid scale variation."""
+    gyroid = Gyroid(scale=scale, thickness=0.0)
+    mesh = generate_mesh(
+        gyroid,
+        resolution=40,
+        iso_value=0.0,
+        bounds=((-5.0, 5.0), (-5.0, 5.0), (-5.0, 5.0))
+    )
+    
+    analysis = analyze_geometry(mesh)
+    material = estimate_material_usage(mesh, material_density=1.24)  # PLA density
+    
+    # Export
+    filename = f"gyroid_scale_{scale:.1f}.stl"
+    mesh.export(filename)
+    
+    return {
+        'scale': scale,
+        'volume': analysis['volume'],
+        'mass': material['mass'],
+        'filename': filename
+    }
+
+
+def _gyroid_thickness_job(thickness):
+    """Generate, analyze and export one Gyroid thickness variation."""
+    gyroid = Gyroid(scale=10.0, thickness=thickness)
+    mesh = generate_mesh(
+        gyroid,
+        resolution=40,
+        iso_value=0.0,
+        bounds=((-5.0, 5.0), (-5.0, 5.0), (-5.0, 5.0))
+    )
+    
+    analysis = analyze_geometry(mesh)
+    
+    # Export
+    filename = f"gyroid_thickness_{thickness:.1f}.stl"
+    mesh.export(filename)
+    
+    return {
+        'thickness': thickness,
+        'volume': analysis['volume'],
+        'surface_area': analysis['surface_area'],
+        'filename': filename
+    }
+
+
+def _gyroid_resolution_job(resolution):
+    """Generate and analyze the reference Gyroid at one resolution."""
+    gyroid = Gyroid(scale=10.0, thickness=0.0)
+    mesh = generate_mesh(
+        gyroid,
+        resolution=resolution,
+        iso_value=0.0,
+        bounds=((-5.0, 5.0), (-5.0, 5.0), (-5.0, 5.0))
+    )
+    
+    analysis = analyze_geometry(mesh)
+    
+    return {
+        'resolution': resolution,
+        'vertices': analysis['vertex_count'],
+        'faces': analysis['face_count'],
+        'volume': analysis['volume']
+    }
+
+
 def batch_gyroid_variations():
     """Generate multiple Gyroid variations with different scales."""
     print("Generating Gyroid variations...")
@@ -25,34 +123,14 @@ def batch_gyroid_variations():
     scales = [8.0, 10.0, 12.0, 15.0]
     results = []
     
-    for scale in scales:
-        print(f"\n  Processing scale={scale}...")
-        
-        gyroid = Gyroid(scale=scale, thickness=0.0)
-        mesh = generate_mesh(
-            gyroid,
-            resolution=40,
-            iso_value=0.0,
-            bounds=((-5.0, 5.0), (-5.0, 5.0), (-5.0, 5.0))
-        )
-        
-        analysis = analyze_geometry(mesh)
-        material = estimate_material_usage(mesh, material_density=1.24)  # PLA density
-        
-        results.append({
-            'scale': scale,
-            'volume': analysis['volume'],
-            'mass': material['mass'],
-            'mesh': mesh
-        })
-        
-        # Export
-        filename = f"gyroid_scale_{scale:.1f}.stl"
-        mesh.export(filename)
-        print(f"    [OK] Exported: {filename}")
-        print(f"    Volume: {analysis['volume']:.2f} mm³")
-        print(f"    Estimated mass: {material['mass']:.2f} g")
+    for result in _run_parallel(_gyroid_scale_job, scales):
+        print(f"\n  Finished scale={result['scale']}")
+        print(f"    [OK] Exported: {result['filename']}")
+        print(f"    Volume: {result['volume']:.2f} mm³")
+        print(f"    Estimated mass: {result['mass']:.2f} g")
+        results.append(result)
     
+    results.sort(key=lambda r: r['scale'])
     return results
 
 
@@ -63,33 +141,14 @@ def batch_thickness_variations():
     thicknesses = [0.0, 0.3, 0.5, 0.7, 1.0]
     results = []
     
-    for thickness in thicknesses:
-        print(f"\n  Processing thickness={thickness}...")
-        
-        gyroid = Gyroid(scale=10.0, thickness=thickness)
-        mesh = generate_mesh(
-            gyroid,
-            resolution=40,
-            iso_value=0.0,
-            bounds=((-5.0, 5.0), (-5.0, 5.0), (-5.0, 5.0))
-        )
-        
-        analysis = analyze_geometry(mesh)
-        
-        results.append({
-            'thickness': thickness,
-            'volume': analysis['volume'],
-            'surface_area': analysis['surface_area'],
-            'mesh': mesh
-        })
-        
-        # Export
-        filename = f"gyroid_thickness_{thickness:.1f}.stl"
-        mesh.export(filename)
-        print(f"    [OK] Exported: {filename}")
-        print(f"    Volume: {analysis['volume']:.2f} mm³")
-        print(f"    Surface Area: {analysis['surface_area']:.2f} mm²")
+    for result in _run_parallel(_gyroid_thickness_job, thicknesses):
+        print(f"\n  Finished thickness={result['thickness']}")
+        print(f"    [OK] Exported: {result['filename']}")
+        print(f"    Volume: {result['volume']:.2f} mm³")
+        print(f"    Surface Area: {result['surface_area']:.2f} mm²")
+        results.append(result)
     
+    results.sort(key=lambda r: r['thickness'])
     return results
 
 
@@ -100,31 +159,14 @@ def parametric_study():
     resolutions = [20, 30, 40, 50, 60]
     results = []
     
-    gyroid = Gyroid(scale=10.0, thickness=0.0)
+    for result in _run_parallel(_gyroid_resolution_job, resolutions):
+        print(f"\n  Finished resolution={result['resolution']}")
+        print(f"    Vertices: {result['vertices']:,}")
+        print(f"    Faces: {result['faces']:,}")
+        print(f"    Volume: {result['volume']:.2f} mm³")
+        results.append(result)
     
-    for resolution in resolutions:
-        print(f"\n  Processing resolution={resolution}...")
-        
-        mesh = generate_mesh(
-            gyroid,
-            resolution=resolution,
-            iso_value=0.0,
-            bounds=((-5.0, 5.0), (-5.0, 5.0), (-5.0, 5.0))
-        )
-        
-        analysis = analyze_geometry(mesh)
-        
-        results.append({
-            'resolution': resolution,
-            'vertices': analysis['vertex_count'],
-            'faces': analysis['face_count'],
-            'volume': analysis['volume'],
-            'mesh': mesh
-        })
-        
-        print(f"    Vertices: {analysis['vertex_count']:,}")
-        print(f"    Faces: {analysis['face_count']:,}")
-        print(f"    Volume: {analysis['volume']:.2f} mm³")
+    results.sort(key=lambda r: r['resolution'])
     
     # Summary
     print("\n  Summary:")
@@ -33,24 +33,30 @@ class SinusoidalField(ScalarField):
 
 class SphericalField(ScalarField):
     """
-    A spherical distance field.
+    A spherical squared-distance field.
     
     Creates a sphere at the origin with radius defined by scale.
+    
+    The field is r² - R² rather than the true signed distance r - R: both
+    are negative inside, positive outside and zero on the same sphere, so
+    the iso-surface at 0 is identical, but no square root is needed.
     """
     
     def evaluate(self, x, y, z):
         """Evaluate the spherical field."""
-        # Distance from origin
-        r = np.sqrt(x**2 + y**2 + z**2)
-        # Return signed distance (negative inside, positive outside)
-        return r - self.scale
+        # Squared distance from origin
+        r2 = x * x + y * y + z * z
+        # Negative inside, positive outside
+        return r2 - self.scale * self.scale
 
 
 class TorusField(ScalarField):
     """
     A torus field.
     
-    Creates a torus with major radius R and minor radius r.
+    Creates a torus with major radius R and minor radius r. Like
+    SphericalField, the outer distance is left squared, (d² + z²) - r²,
+    which has the same zero iso-surface as the true distance field.
     """
     
     def __init__(self, scale=1.0, major_radius=3.0, minor_radius=1.0):
@@ -60,10 +66,11 @@ class TorusField(ScalarField):
     
     def evaluate(self, x, y, z):
         """Evaluate the torus field."""
-        # Distance from torus center in XY plane
-        xy_dist = np.sqrt(x**2 + y**2) - self.major_radius
-        # Distance from torus surface
-        return np.sqrt(xy_dist**2 + z**2) - self.minor_radius
+        # Distance from torus center circle in XY plane
+        xy2 = x * x + y * y
+        xy_dist = np.sqrt(xy2) - self.major_radius
+        # Squared distance from the center circle, minus r²
+        return (xy_dist * xy_dist + z * z) - self.minor_radius * self.minor_radius
 
 
 def example_sinusoidal():
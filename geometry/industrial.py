@@ -12,7 +12,7 @@ import trimesh
 from typing import Dict, Tuple, Optional
 
 
-def calculate_volume(mesh: trimesh.Trimesh) -> float:
+def calculate_volume(mesh: trimesh.Trimesh, _is_volume: Optional[bool] = None) -> float:
     """
     Calculate the volume of a closed mesh.
     
@@ -24,6 +24,9 @@ def calculate_volume(mesh: trimesh.Trimesh) -> float:
     ----------
     mesh : trimesh.Trimesh
         The mesh to calculate volume for
+    _is_volume : bool, optional
+        Already known value of ``mesh.is_volume``, so callers that need the
+        flag themselves do not pay for the topology checks twice
     
     Returns
     -------
@@ -36,13 +39,42 @@ def calculate_volume(mesh: trimesh.Trimesh) -> float:
     >>> volume = calculate_volume(mesh)
     >>> print(f"Volume: {volume:.2f} mm³")
     """
-    if not mesh.is_volume:
+    if _is_volume is None:
+        _is_volume = mesh.is_volume
+    if not _is_volume:
         # For open meshes, return 0 or surface area
         return 0.0
     
     return float(mesh.volume)
 
 
+def _bounds_arr(mesh: trimesh.Trimesh) -> np.ndarray:
+    """Return the mesh bounds as a (2, 3) float array of (min, max) corners."""
+    return np.asarray(mesh.bounds, dtype=np.float64)
+
+
+def _bbox_from_bounds(bounds: np.ndarray) -> Dict[str, Tuple[float, float]]:
+    """Build the bounding box dictionary from a (2, 3) bounds array."""
+    (x_min, y_min, z_min), (x_max, y_max, z_max) = bounds.tolist()
+    
+    return {
+        'x': (x_min, x_max),
+        'y': (y_min, y_max),
+        'z': (z_min, z_max)
+    }
+
+
+def _dimensions_from_bounds(bounds: np.ndarray) -> Dict[str, float]:
+    """Build the dimensions dictionary from a (2, 3) bounds array."""
+    width, height, depth = (bounds[1] - bounds[0]).tolist()
+    
+    return {
+        'width': width,
+        'height': height,
+        'depth': depth
+    }
+
+
 def calculate_bounding_box(mesh: trimesh.Trimesh) -> Dict[str, Tuple[float, float]]:
     """
     Calculate the axis-aligned bounding box of a mesh.
@@ -67,13 +99,7 @@ def calculate_bounding_box(mesh: trimesh.Trimesh) -> Dict[str, Tuple[float, floa
     >>> bbox = calculate_bounding_box(mesh)
     >>> print(f"X range: {bbox['x']}")
     """
-    bounds = mesh.bounds
-    
-    return {
-        'x': (float(bounds[0, 0]), float(bounds[1, 0])),
-        'y': (float(bounds[0, 1]), float(bounds[1, 1])),
-        'z': (float(bounds[0, 2]), float(bounds[1, 2]))
-    }
+    return _bbox_from_bounds(_bounds_arr(mesh))
 
 
 def calculate_dimensions(mesh: trimesh.Trimesh) -> Dict[str, float]:
@@ -97,13 +123,7 @@ def calculate_dimensions(mesh: trimesh.Trimesh) -> Dict[str, float]:
     >>> dims = calculate_dimensions(mesh)
     >>> print(f"Dimensions: {dims}")
     """
-    bbox = calculate_bounding_box(mesh)
-    
-    return {
-        'width': bbox['x'][1] - bbox['x'][0],
-        'height': bbox['y'][1] - bbox['y'][0],
-        'depth': bbox['z'][1] - bbox['z'][0]
-    }
+    return _dimensions_from_bounds(_bounds_arr(mesh))
 
 
 def analyze_geometry(mesh: trimesh.Trimesh) -> Dict:
@@ -137,20 +157,24 @@ def analyze_geometry(mesh: trimesh.Trimesh) -> Dict:
     >>> print(f"Volume: {analysis['volume']:.2f} mm³")
     >>> print(f"Dimensions: {analysis['dimensions']}")
     """
-    bbox = calculate_bounding_box(mesh)
-    dimensions = calculate_dimensions(mesh)
-    volume = calculate_volume(mesh)
+    # Read each mesh property once; the bounds give both the box and the
+    # dimensions, and the volume check is shared with the volume itself
+    bounds = _bounds_arr(mesh)
+    is_volume = bool(mesh.is_volume)
+    n_faces = len(mesh.faces)
     
     return {
-        'volume': volume,
+        'volume': calculate_volume(mesh, is_volume),
         'surface_area': float(mesh.area),
-        'bbox': bbox,
-        'dimensions': dimensions,
-        'is_watertight': mesh.is_watertight,
-        'is_volume': mesh.is_volume,
+        'bbox': _bbox_from_bounds(bounds),
+        'dimensions': _dimensions_from_bounds(bounds),
+        'is_watertight': bool(mesh.is_watertight),
+        'is_volume': is_volume,
         'vertex_count': len(mesh.vertices),
-        'face_count': len(mesh.faces),
-        'edge_count': len(mesh.edges)
+        'face_count': n_faces,
+        # mesh.edges lists the three edges of every face; count them
+        # without building the (3F, 2) array
+        'edge_count': 3 * n_faces
     }
 
 
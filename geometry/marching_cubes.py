@@ -6,15 +6,170 @@ This module implements the Marching Cubes algorithm to extract triangular
 meshes from scalar fields. The algorithm generates iso-surfaces by sampling
 the field on a regular grid and creating triangles based on the field values
 at grid vertices.
+
+When Numba is installed, the surface is extracted by the compiled
+lookup-table kernel in geometry.mc_jit; otherwise scikit-image's
+implementation is used, or a vectorised NumPy version of the lookup-table
+algorithm when neither is installed. The sampled grids of recent calls are
+cached, so sweeping the iso-value over one field evaluates the field only
+once.
 """
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import trimesh
 from typing import Tuple, Optional
-from scipy.spatial import Delaunay
-from scipy.ndimage import map_coordinates
 
 from core.fields import ScalarField
+from geometry import mc_jit
+from geometry.mc_tables import (CORNER_OFFSETS, EDGE_CORNERS, EDGE_AXIS, TRI_COUNT, TRI_TABLE,
+                                MAX_TRIANGLES)
+
+# scikit-image is optional; resolved once here rather than on every call
+try:
+    from skimage.measure import marching_cubes as _sk_mc
+except ImportError:
+    _sk_mc = None
+
+# Cubes per block along each axis for the empty-block filter
+_BLOCK_CUBES = 4
+
+# Number of sampled grids kept for reuse by later generate_mesh calls
+_GRID_CACHE_SIZE = 8
+
+# Recently sampled grids keyed on (field key, resolution, bounds), least
+# recently used first; the grids are shared and must never be modified
+_grid_cache = OrderedDict()
+_grid_cache_lock = threading.Lock()
+
+# Budget for the fractional-index arrays of one block of resampled planes
+_RESAMPLE_BLOCK_BYTES = 4 * 1024 * 1024
+
+
+def _sample_field(field: ScalarField, resolution: int,
+                  bounds: Tuple[Tuple[float, float],
+                                Tuple[float, float],
+                                Tuple[float, float]],
+                  resample: bool = False) -> np.ndarray:
+    """
+    Sample a field on the mesh grid, reusing a cached grid when possible.
+    
+    With `resample`, a cache miss is served by trilinear interpolation of a
+    cached grid of the same field that covers `bounds`, when there is one;
+    only grids sampled from the field itself are cached and interpolated.
+    """
+    field_key = field._cache_key()
+    if field_key is None:
+        return field.evaluate_grid_values(bounds[0], bounds[1], bounds[2], resolution)
+    
+    key = (field_key, int(resolution), tuple(tuple(map(float, b)) for b in bounds))
+    with _grid_cache_lock:
+        if key in _grid_cache:
+            _grid_cache.move_to_end(key)
+            return _grid_cache[key]
+        base = _covering_grid(key) if resample else None
+    
+    if base is not None:
+        return _resample_grid(*base, key[1], key[2])
+    
+    field_values = field.evaluate_grid_values(bounds[0], bounds[1], bounds[2], resolution)
+    with _grid_cache_lock:
+        _grid_cache[key] = field_values
+        if len(_grid_cache) > _GRID_CACHE_SIZE:
+            _grid_cache.popitem(last=False)
+    return field_values
+
+
+def _covering_grid(key: tuple) -> Optional[tuple]:
+    """
+    Find the finest cached grid of the same field that covers the bounds of `key`.
+    
+    Returns the grid with its bounds, or None. Must be called with the
+    cache lock held.
+    """
+    field_key, _, bounds = key
+    best, best_spacing = None, np.inf
+    for (cached_key, resolution, cached_bounds), values in _grid_cache.items():
+        if cached_key != field_key or resolution < 2:
+            continue
+        if not all(lo < hi and lo <= new_lo and new_hi <= hi
+                   for (lo, hi), (new_lo, new_hi) in zip(cached_bounds, bounds)):
+            continue
+        spacing = max((hi - lo) / (resolution - 1) for lo, hi in cached_bounds)
+        if spacing < best_spacing:
+            best, best_spacing = (values, cached_bounds), spacing
+    return best
+
+
+def _resample_grid(values: np.ndarray,
+                   base_bounds: Tuple[Tuple[float, float], ...],
+                   resolution: int,
+                   bounds: Tuple[Tuple[float, float], ...]) -> np.ndarray:
+    """
+    Interpolate a sampled grid onto the mesh grid over `bounds`.
+    
+    The new sample positions are converted to fractional indices into the
+    base grid and interpolated linearly with map_coordinates, a few planes
+    at a time so the coordinate arrays stay small.
+    """
+    # Resampling is opt-in, so scipy.ndimage is only loaded when it is used
+    from scipy.ndimage import map_coordinates
+    
+    indices = [
+        (np.linspace(new_lo, new_hi, resolution) - lo) * ((n - 1) / (hi - lo))
+        for (lo, hi), (new_lo, new_hi), n in zip(base_bounds, bounds, values.shape)
+    ]
+    
+    resampled = np.empty((resolution,) * 3, dtype=values.dtype)
+    planes = max(1, _RESAMPLE_BLOCK_BYTES // (3 * 8 * resolution * resolution))
+    for start in range(0, resolution, planes):
+        coords = np.meshgrid(indices[0][start:start + planes], indices[1], indices[2],
+                             indexing='ij')
+        map_coordinates(values, coords, output=resampled[start:start + planes],
+                        order=1, mode='nearest')
+    return resampled
+
+
+def _clear_grid_cache() -> None:
+    """Drop all cached grids."""
+    with _grid_cache_lock:
+        _grid_cache.clear()
+
+
+def _block_range(values: np.ndarray, block: int, reduce) -> np.ndarray:
+    """
+    Reduce a volume over blocks of `block` cubes along each axis.
+    
+    Each block covers `block + 1` samples per axis, sharing its last sample
+    plane with the next block, so every cube lies entirely inside its block.
+    The samples are folded in one strided plane at a time, which streams
+    through memory far faster than a blocked `reduceat`.
+    """
+    for axis in range(3):
+        planes = np.moveaxis(values, axis, 0)
+        n_blocks = len(range(0, max(planes.shape[0] - 1, 1), block))
+        reduced = planes[::block][:n_blocks].copy()
+        for offset in range(1, block + 1):
+            shifted = planes[offset::block][:n_blocks]
+            reduce(reduced[:len(shifted)], shifted, out=reduced[:len(shifted)])
+        values = np.moveaxis(reduced, 0, axis)
+    return values
+
+
+def _active_blocks(signs: np.ndarray, block: int = _BLOCK_CUBES) -> np.ndarray:
+    """
+    Flag the blocks of cubes that the iso-surface can pass through.
+    
+    A block can only contain surface when some of its samples are below the
+    iso-value and some are not, which is read off the sign grid with a
+    blockwise any/all; for thin TPMS shells most blocks fail this test and
+    are skipped by the extraction.
+    """
+    any_below = _block_range(signs, block, np.maximum)
+    all_below = _block_range(signs, block, np.minimum)
+    return any_below & ~all_below
 
 
 def generate_mesh(field: ScalarField, 
@@ -22,7 +177,10 @@ def generate_mesh(field: ScalarField,
                   iso_value: float = 0.0,
                   bounds: Optional[Tuple[Tuple[float, float], 
                                         Tuple[float, float], 
-                                        Tuple[float, float]]] = None) -> trimesh.Trimesh:
+                                        Tuple[float, float]]] = None,
+                  dtype: Optional[np.dtype] = None,
+                  clean: bool = False,
+                  resample: bool = False) -> trimesh.Trimesh:
     """
     Generate a triangular mesh from a scalar field using the Marching Cubes algorithm.
     
@@ -40,6 +198,25 @@ def generate_mesh(field: ScalarField,
     bounds : tuple of tuples, optional
         Bounding box as ((x_min, x_max), (y_min, y_max), (z_min, z_max)),
         by default None (uses (-5, 5) for each axis)
+    dtype : np.dtype, optional
+        Floating point type of the sampled grid, by default None (the
+        field's dtype, float32 unless configured otherwise). The grid is
+        sampled in the field's dtype and then cast, so sampling in double
+        precision requires a field created with dtype=np.float64
+    clean : bool, optional
+        Run trimesh's cleanup passes (dropping unreferenced vertices and
+        merging coincident ones) on the result, by default False. All
+        extraction paths already return welded meshes without unreferenced
+        vertices, so this is only needed to merge the rare coincident
+        vertices created where a sample lies exactly on the iso-value
+    resample : bool, optional
+        Allow the grid to be interpolated from a cached grid of the same
+        field instead of evaluating the field, by default False. When a
+        recent call sampled bounds that cover `bounds`, the new grid is
+        resampled from it trilinearly, limited to the base grid's detail.
+        This pays off for fields that are expensive to evaluate; the
+        built-in TPMS grids are assembled from axis tables and are cheaper
+        to sample exactly
     
     Returns
     -------
@@ -52,6 +229,15 @@ def generate_mesh(field: ScalarField,
     >>> gyroid = Gyroid(scale=10.0)
     >>> mesh = generate_mesh(gyroid, resolution=50, iso_value=0.0)
     >>> mesh.export('gyroid.stl')
+    
+    Notes
+    -----
+    The sampled grids of the last few calls are cached per field parameters,
+    resolution and bounds; call ``generate_mesh.cache_clear()`` to release
+    them. Resampled grids are not cached, so every resampling starts from
+    an exactly sampled grid. The field hands over a fresh grid buffer, but
+    once cached it is shared between calls, so the extraction only reads
+    it: the sign grid and any dtype conversion are new arrays.
     """
     # Set default bounds if not provided
     if bounds is None:
@@ -61,94 +247,177 @@ def generate_mesh(field: ScalarField,
     y_min, y_max = bounds[1]
     z_min, z_max = bounds[2]
     
-    # Create coordinate grids
-    x = np.linspace(x_min, x_max, resolution)
-    y = np.linspace(y_min, y_max, resolution)
-    z = np.linspace(z_min, z_max, resolution)
+    # Evaluate field on grid (values only; coordinates follow from bounds),
+    # or reuse (or, on request, resample) the grid of a recent call
+    field_values = _sample_field(field, resolution, bounds, resample)
+    if dtype is not None:
+        field_values = field_values.astype(dtype, copy=False)
+    if field_values.dtype.name not in mc_jit.KERNEL_DTYPES:
+        field_values = field_values.astype(np.float64)
     
-    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+    # Compare in the grid's own precision, so the block filter and the
+    # extraction agree on which samples lie below the iso-value
+    level = field_values.dtype.type(iso_value)
     
-    # Evaluate field on grid
-    field_values = field(X, Y, Z)
+    spacing = (
+        (x_max - x_min) / (resolution - 1),
+        (y_max - y_min) / (resolution - 1),
+        (z_max - z_min) / (resolution - 1)
+    )
     
-    # Use scikit-image's marching cubes implementation (more robust)
-    try:
-        from skimage import measure
-        # scikit-image has a well-tested marching cubes implementation
-        spacing = (
-            (x_max - x_min) / (resolution - 1),
-            (y_max - y_min) / (resolution - 1),
-            (z_max - z_min) / (resolution - 1)
-        )
-        
-        vertices, faces, normals, values = measure.marching_cubes(
-            field_values, 
-            level=iso_value,
-            spacing=spacing
+    # One byte per sample flags the samples below the iso-value; the case
+    # lookups read these signs, and the float values are only read to
+    # interpolate the crossings
+    signs = np.less(field_values, level)
+    
+    # Per-block sign ranges rule out the blocks the surface cannot cross
+    active = _active_blocks(signs)
+    
+    if mc_jit.NUMBA_AVAILABLE:
+        # Compiled lookup-table kernel: emits welded vertices directly in
+        # world coordinates, without computing per-vertex normals
+        vertices, faces = mc_jit.mc_extract(
+            field_values,
+            float(level),
+            np.array(spacing, dtype=np.float64),
+            np.array((x_min, y_min, z_min), dtype=np.float64),
+            active,
+            _BLOCK_CUBES,
+            signs
         )
+        mesh = trimesh.Trimesh(vertices=vertices, faces=faces,
+                               process=False, validate=False)
         
-        # Transform vertices from grid coordinates to real coordinates
-        # marching_cubes returns vertices in grid space, need to add origin
-        vertices[:, 0] = vertices[:, 0] + x_min
-        vertices[:, 1] = vertices[:, 1] + y_min
-        vertices[:, 2] = vertices[:, 2] + z_min
-        
-        # Create trimesh object
-        mesh = trimesh.Trimesh(vertices=vertices, faces=faces, vertex_normals=normals)
-        
-    except ImportError:
-        # Fallback: use trimesh's marching cubes if scikit-image not available
-        # This is a simplified implementation
-        mesh = _marching_cubes_simple(field, resolution, iso_value, bounds)
+    else:
+        mesh = _marching_cubes_skimage(field_values, signs, resolution, level,
+                                       bounds, spacing, active)
     
-    # Clean up mesh
-    mesh.remove_unreferenced_vertices()
-    mesh.merge_vertices()
+    # Clean up mesh on request; the extraction output is already compact,
+    # so the meshes above are built without trimesh's implicit processing
+    if clean:
+        mesh.remove_unreferenced_vertices()
+        mesh.merge_vertices()
     
     return mesh
 
 
-def _marching_cubes_simple(field: ScalarField,
-                           resolution: int,
-                           iso_value: float,
-                           bounds: Tuple[Tuple[float, float], 
-                                        Tuple[float, float], 
-                                        Tuple[float, float]]) -> trimesh.Trimesh:
+generate_mesh.cache_clear = _clear_grid_cache
+
+
+def _marching_cubes_skimage(field_values: np.ndarray,
+                            signs: np.ndarray,
+                            resolution: int,
+                            level: float,
+                            bounds: Tuple[Tuple[float, float], 
+                                         Tuple[float, float], 
+                                         Tuple[float, float]],
+                            spacing: Tuple[float, float, float],
+                            active: np.ndarray) -> trimesh.Trimesh:
     """
-    Simplified marching cubes implementation using trimesh.
+    Extract the mesh with scikit-image's marching cubes implementation.
     
-    This is a fallback when scikit-image is not available.
+    This is used when Numba is not available for the compiled kernel. Cubes
+    in inactive blocks are masked out of the extraction.
     """
-    x_min, x_max = bounds[0]
-    y_min, y_max = bounds[1]
-    z_min, z_max = bounds[2]
+    if _sk_mc is None:
+        # Fallback: vectorised NumPy marching cubes if scikit-image is not available
+        return _marching_cubes_simple(field_values, level, bounds, spacing, signs)
+    
+    x_min, y_min, z_min = bounds[0][0], bounds[1][0], bounds[2][0]
     
-    # Create a dense point cloud by sampling the field
-    x = np.linspace(x_min, x_max, resolution)
-    y = np.linspace(y_min, y_max, resolution)
-    z = np.linspace(z_min, z_max, resolution)
+    # Expand the block flags to one flag per cube; scikit-image reads the
+    # flag of each cube at its upper corner sample
+    cubes = active
+    for axis in range(3):
+        cubes = np.repeat(cubes, _BLOCK_CUBES, axis=axis)
+    nx, ny, nz = field_values.shape
+    mask = np.zeros(field_values.shape, dtype=bool)
+    mask[1:, 1:, 1:] = cubes[:nx - 1, :ny - 1, :nz - 1]
     
-    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
-    field_values = field(X, Y, Z)
+    vertices, faces, normals, values = _sk_mc(
+        field_values, 
+        level=level,
+        spacing=spacing,
+        mask=mask
+    )
+    
+    # Transform vertices from grid coordinates to real coordinates
+    # marching_cubes returns vertices in grid space, need to add origin
+    vertices[:, 0] = vertices[:, 0] + x_min
+    vertices[:, 1] = vertices[:, 1] + y_min
+    vertices[:, 2] = vertices[:, 2] + z_min
+    
+    # Create trimesh object; the output is welded already, so trimesh's
+    # processing is left to the cleanup passes of generate_mesh
+    return trimesh.Trimesh(vertices=vertices, faces=faces, vertex_normals=normals,
+                           process=False, validate=False)
+
+
+def _marching_cubes_simple(field_values: np.ndarray,
+                           level: float,
+                           bounds: Tuple[Tuple[float, float], 
+                                        Tuple[float, float], 
+                                        Tuple[float, float]],
+                           spacing: Tuple[float, float, float],
+                           signs: Optional[np.ndarray] = None) -> trimesh.Trimesh:
+    """
+    Vectorised NumPy marching cubes using the shared lookup tables.
     
-    # Find points near the iso-surface
-    mask = np.abs(field_values - iso_value) < 0.1 * np.std(field_values)
-    points = np.stack([X[mask], Y[mask], Z[mask]], axis=1)
+    This is the fallback when neither Numba nor scikit-image is available.
+    All cubes are classified at once; every crossing point is created once
+    per grid edge and looked up by the triangles that use it, so the mesh
+    comes out welded.
+    """
+    origin = np.array([bounds[0][0], bounds[1][0], bounds[2][0]], dtype=np.float64)
+    spacing = np.asarray(spacing, dtype=np.float64)
+    shape = field_values.shape
+    below = np.less(field_values, level) if signs is None else signs
     
-    if len(points) < 4:
-        # Not enough points, return empty mesh
-        return trimesh.Trimesh()
+    # Case index of every cube from its eight corner signs
+    nx, ny, nz = (n - 1 for n in shape)
+    cases = np.zeros((nx, ny, nz), dtype=np.uint8)
+    for corner, (di, dj, dk) in enumerate(CORNER_OFFSETS):
+        cases |= below[di:di + nx, dj:dj + ny, dk:dk + nz].view(np.uint8) << corner
     
-    # Create mesh from point cloud using Delaunay triangulation
-    # This is a simplified approach - full marching cubes would be more accurate
-    try:
-        tri = Delaunay(points)
-        mesh = trimesh.Trimesh(vertices=points, faces=tri.simplices)
+    # Crossing points on the grid edges along each axis, identified by the
+    # sorted linear index of the edge's lower sample
+    edge_index, positions = [], []
+    for axis in range(3):
+        lower = [slice(None)] * 3
+        upper = [slice(None)] * 3
+        lower[axis] = slice(None, -1)
+        upper[axis] = slice(1, None)
+        points = np.nonzero(below[tuple(lower)] != below[tuple(upper)])
         
-        # Remove degenerate faces
-        mesh = mesh[mesh.area > 1e-10]
+        v0 = field_values[tuple(lower)][points].astype(np.float64)
+        v1 = field_values[tuple(upper)][points].astype(np.float64)
+        grid = np.column_stack(points).astype(np.float64)
+        grid[:, axis] += (level - v0) / (v1 - v0)
         
-        return mesh
-    except:
-        # If triangulation fails, return empty mesh
-        return trimesh.Trimesh()
+        edge_index.append(np.ravel_multi_index(points, shape))
+        positions.append(origin + spacing * grid)
+    
+    first_vertex = np.cumsum([0] + [len(p) for p in positions])
+    vertices = np.concatenate(positions)
+    
+    # Triangles of all cubes, as (cube, triangle slot) pairs; the explicit
+    # width keeps the reshape valid when no cube crosses the level
+    cube_index = np.flatnonzero(TRI_COUNT[cases.ravel()])
+    triangles = TRI_TABLE[cases.ravel()[cube_index]].reshape(-1, MAX_TRIANGLES, 3)
+    cube_slot, tri_slot = np.nonzero(triangles[:, :, 0] >= 0)
+    edges = triangles[cube_slot, tri_slot]
+    cube = np.unravel_index(cube_index[cube_slot], (nx, ny, nz))
+    
+    # Map each triangle corner to the vertex on its grid edge
+    corner = CORNER_OFFSETS[EDGE_CORNERS[edges, 0]]
+    linear = np.ravel_multi_index(
+        tuple(cube[n][:, None] + corner[..., n] for n in range(3)), shape
+    )
+    axes = EDGE_AXIS[edges]
+    faces = np.empty(edges.shape, dtype=np.int64)
+    for axis in range(3):
+        on_axis = axes == axis
+        faces[on_axis] = first_vertex[axis] + np.searchsorted(edge_index[axis],
+                                                              linear[on_axis])
+    
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False, validate=False)
@@ -0,0 +1,257 @@
+"""
+JIT-Compiled Marching Cubes Kernel
+Created by Jaime Estela | https://github.com/Jaimeestela | studio@jaimeestela.com
+
+This module provides an optional Numba-compiled, table-driven Marching Cubes
+kernel. It scans the sampled volume slab by slab, skipping blocks of cubes
+whose value range excludes the iso-value, packs the eight corner signs of
+every remaining cube into a case index (read from a one-byte-per-sample
+sign grid, so the scan touches the float values only to interpolate the
+crossings), and emits vertices and triangles
+straight from the lookup tables in geometry.mc_tables, already scaled and
+offset into world coordinates.
+
+Every crossing point is created once, by the first cube that reaches it,
+and its index is kept in a rolling two-plane map of grid edges, so
+neighbouring cubes share their vertices and the output mesh is welded
+without a separate merge pass. Large volumes are split into slabs that
+are extracted on parallel threads (the kernel releases the GIL) and
+stitched along their shared planes.
+
+The kernel is compiled eagerly for float32 and float64 volumes when this
+module is imported, and cached on disk. Numba is an optional dependency;
+when it is not installed, NUMBA_AVAILABLE is False and mesh generation
+falls back to scikit-image.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from geometry.mc_tables import (CORNER_OFFSETS, EDGE_CORNERS, EDGE_AXIS, EDGE_TABLE,
+                                TRI_COUNT, TRI_TABLE)
+
+try:
+    from numba import njit, get_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Floating point types the kernel is compiled for
+KERNEL_DTYPES = ('float32', 'float64')
+
+# Minimum number of cube layers per slab before extraction is split across
+# threads; thinner slabs spend more on stitching than they save
+MIN_SLAB_LAYERS = 16
+
+# (volume, signs, level, spacing, origin, active, block, i0, shared_last,
+# corners, edge_grid, edge_table, tri_count, tri_table)
+# -> (vertices, faces, first_plane);
+# the tables are passed in rather than read as globals, which Numba would
+# freeze into the on-disk cache
+_EXTRACT_SIGNATURES = [
+    f'Tuple((f8[:, ::1], i8[:, ::1], i8[:, :, ::1]))({t}[:, :, ::1], b1[:, :, ::1], f8, '
+    f'f8[::1], f8[::1], b1[:, :, ::1], i8, i8, b1, i8[:, ::1], i8[:, ::1], i8[::1], i8[::1], '
+    f'i8[:, ::1])'
+    for t in KERNEL_DTYPES
+]
+
+# Per-edge grid offset (di, dj, dk) of the lower corner and axis, so a cube
+# edge maps to the grid edge that owns its crossing point
+_EDGE_GRID = np.ascontiguousarray(
+    np.column_stack([CORNER_OFFSETS[EDGE_CORNERS[:, 0]], EDGE_AXIS]), dtype=np.int64
+)
+
+
+def _mc_extract(volume, signs, level, spacing, origin, active, block, i0, shared_last,
+                corners, edge_grid, edge_table, tri_count, tri_table):
+    """
+    Extract the iso-surface of a slab of planes starting at global plane i0.
+
+    Returns welded (vertices, faces) and the vertex indices on the edges of
+    the slab's first plane. When `shared_last` is set, the last plane
+    belongs to the next slab: crossings on it are not created here, and
+    faces refer to them as -2 - ((j * nz + k) * 3 + axis) instead.
+    """
+    nx, ny, nz = volume.shape
+    # Vertex index of the crossing on each grid edge, for two planes
+    # (-1 while no cube has reached the edge)
+    edge_ids = np.full((2, ny, nz, 3), -1, dtype=np.int64)
+    first_plane = np.full((ny, nz, 3), -1, dtype=np.int64)
+
+    # Counting pass over the active cubes, so the output buffers are sized
+    # exactly once. Each crossed edge is counted by one canonical cube: the
+    # one holding it at its lower offsets, or at the upper offsets on the
+    # far boundary of the volume (but not on a last plane owned by the
+    # next slab)
+    n_vertices = 0
+    n_faces = 0
+    for i in range(nx - 1):
+        bi = (i0 + i) // block
+        upper_i = i == nx - 2 and not shared_last
+        for j in range(ny - 1):
+            bj = j // block
+            for k in range(nz - 1):
+                if not active[bi, bj, k // block]:
+                    continue
+                case = 0
+                for corner in range(8):
+                    if signs[i + corners[corner, 0], j + corners[corner, 1],
+                             k + corners[corner, 2]]:
+                        case |= 1 << corner
+                if tri_count[case] == 0:
+                    continue
+                n_faces += tri_count[case]
+                for edge in range(12):
+                    if (edge_table[case] >> edge) & 1 and \
+                            (edge_grid[edge, 0] == 0 or upper_i) and \
+                            (edge_grid[edge, 1] == 0 or j == ny - 2) and \
+                            (edge_grid[edge, 2] == 0 or k == nz - 2):
+                        n_vertices += 1
+
+    vertices = np.empty((n_vertices, 3), dtype=np.float64)
+    faces = np.empty((n_faces, 3), dtype=np.int64)
+    n_vertices = 0
+    n_faces = 0
+
+    for i in range(nx - 1):
+        # Plane i + 1 takes over the slot of plane i - 1
+        edge_ids[(i + 1) % 2] = -1
+        bi = (i0 + i) // block
+
+        for j in range(ny - 1):
+            bj = j // block
+            for k in range(nz - 1):
+                # Cubes in blocks whose value range excludes the level are skipped
+                if not active[bi, bj, k // block]:
+                    continue
+
+                case = 0
+                for corner in range(8):
+                    if signs[i + corners[corner, 0], j + corners[corner, 1],
+                             k + corners[corner, 2]]:
+                        case |= 1 << corner
+                count = tri_count[case]
+                if count == 0:
+                    continue
+
+                for t in range(count):
+                    for n in range(3):
+                        edge = tri_table[case, 3 * t + n]
+                        pi = i + edge_grid[edge, 0]
+                        pj = j + edge_grid[edge, 1]
+                        pk = k + edge_grid[edge, 2]
+                        axis = edge_grid[edge, 3]
+                        vertex = edge_ids[pi % 2, pj, pk, axis]
+
+                        if vertex == -1 and shared_last and pi == nx - 1:
+                            # Owned by the next slab; refer to it by position
+                            vertex = -2 - ((pj * nz + pk) * 3 + axis)
+                            edge_ids[pi % 2, pj, pk, axis] = vertex
+
+                        # The first cube to reach a crossing creates its vertex
+                        if vertex == -1:
+                            v0 = volume[pi, pj, pk]
+                            if axis == 0:
+                                v1 = volume[pi + 1, pj, pk]
+                            elif axis == 1:
+                                v1 = volume[pi, pj + 1, pk]
+                            else:
+                                v1 = volume[pi, pj, pk + 1]
+                            u = (level - v0) / (v1 - v0)
+                            vertices[n_vertices, 0] = origin[0] + spacing[0] * (i0 + pi + (u if axis == 0 else 0.0))
+                            vertices[n_vertices, 1] = origin[1] + spacing[1] * (pj + (u if axis == 1 else 0.0))
+                            vertices[n_vertices, 2] = origin[2] + spacing[2] * (pk + (u if axis == 2 else 0.0))
+                            vertex = n_vertices
+                            edge_ids[pi % 2, pj, pk, axis] = vertex
+                            n_vertices += 1
+
+                        faces[n_faces, n] = vertex
+                    n_faces += 1
+
+        # Only the first layer of cubes touches the first plane
+        if i == 0:
+            first_plane[:] = edge_ids[0]
+
+    return vertices, faces, first_plane
+
+
+if NUMBA_AVAILABLE:
+    # nogil lets the slabs of one volume run on parallel threads
+    _mc_extract_kernel = njit(_EXTRACT_SIGNATURES, nogil=True, cache=True)(_mc_extract)
+
+
+def mc_extract(volume, level, spacing, origin, active=None, block=None, signs=None,
+               workers=None):
+    """
+    Extract the iso-surface of a sampled volume with the compiled kernel.
+
+    Parameters
+    ----------
+    volume : np.ndarray
+        C-contiguous float32 or float64 array of shape (nx, ny, nz)
+    level : float
+        Iso-value at which to extract the surface
+    spacing : np.ndarray
+        Float64 grid spacing along x, y and z
+    origin : np.ndarray
+        Float64 world position of volume[0, 0, 0]
+    active : np.ndarray, optional
+        Boolean mask over blocks of `block` cubes per axis; cubes in
+        inactive blocks are skipped. By default every cube is visited
+    block : int, optional
+        Number of cubes per block along each axis
+    signs : np.ndarray, optional
+        C-contiguous boolean array flagging the samples below `level`,
+        computed from `volume` when not given
+    workers : int, optional
+        Number of threads, by default Numba's thread count (the number of
+        CPUs unless limited by NUMBA_NUM_THREADS or numba.set_num_threads).
+        The volume is split into slabs along x, each at least
+        MIN_SLAB_LAYERS cubes thick, and the slab meshes are stitched along
+        their shared planes
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Float64 vertices of shape (V, 3) in world coordinates and int64
+        faces of shape (F, 3)
+    """
+    if active is None:
+        active, block = np.ones((1, 1, 1), dtype=bool), max(volume.shape)
+    if signs is None:
+        signs = volume < volume.dtype.type(level)
+    active = np.ascontiguousarray(active)
+    
+    # Slabs along x are contiguous views of the volume, so nothing is copied
+    layers = volume.shape[0] - 1
+    if workers is None:
+        workers = get_num_threads()
+    n_slabs = max(1, min(workers, layers // MIN_SLAB_LAYERS))
+    bounds = np.linspace(0, layers, n_slabs + 1).astype(np.int64)
+
+    def extract(s):
+        i0, i1 = bounds[s], bounds[s + 1]
+        return _mc_extract_kernel(volume[i0:i1 + 1], signs[i0:i1 + 1], level, spacing,
+                                  origin, active, block, i0, s < n_slabs - 1,
+                                  CORNER_OFFSETS, _EDGE_GRID, EDGE_TABLE, TRI_COUNT,
+                                  TRI_TABLE)
+
+    if n_slabs == 1:
+        vertices, faces, _ = extract(0)
+        return vertices, faces
+    with ThreadPoolExecutor(max_workers=n_slabs) as executor:
+        slabs = list(executor.map(extract, range(n_slabs)))
+
+    # Shift each slab's faces past the vertices of the slabs before it, and
+    # resolve references to the next slab's first plane
+    first_vertex = np.cumsum([0] + [len(v) for v, _, _ in slabs])
+    for s, (_, faces, _) in enumerate(slabs):
+        shared = faces < -1
+        if s < n_slabs - 1:
+            next_plane = slabs[s + 1][2].reshape(-1)
+            faces[shared] = first_vertex[s + 1] + next_plane[-2 - faces[shared]]
+        faces[~shared] += first_vertex[s]
+
+    return (np.concatenate([v for v, _, _ in slabs]),
+            np.concatenate([f for _, f, _ in slabs]))
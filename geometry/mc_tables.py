@@ -0,0 +1,135 @@
+"""
+Marching Cubes Lookup Tables
+Created by Jaime Estela | https://github.com/Jaimeestela | studio@jaimeestela.com
+
+This module provides the 256-entry edge and triangle tables used by the
+table-driven Marching Cubes kernels. The tables follow the classical
+Lorensen and Cline layout (corner and edge numbering as in Paul Bourke's
+tables), but are derived once at import time from the cube topology instead
+of being transcribed by hand.
+
+For every case the surface is traced face by face: on each cube face the
+crossing points are joined so that the corners inside the surface are kept
+apart, and the resulting segments are chained into closed polygons, which
+are fanned into triangles. Because the rule on a face depends only on that
+face's four corners, two cubes sharing a face always agree on its segments,
+so the extracted surface is free of cracks. Triangles are wound so that
+their normals point out of the region where the field is below the
+iso-value.
+
+Attributes
+----------
+CORNER_OFFSETS : np.ndarray
+    (8, 3) grid offsets of the cube corners
+EDGE_CORNERS : np.ndarray
+    (12, 2) corner pairs joined by each cube edge, lower corner first
+EDGE_AXIS : np.ndarray
+    (12,) axis (0, 1 or 2) along which each edge runs
+EDGE_TABLE : np.ndarray
+    (256,) bitmask of the edges crossed by the surface for each case
+TRI_COUNT : np.ndarray
+    (256,) number of triangles emitted for each case
+TRI_TABLE : np.ndarray
+    (256, 3 * MAX_TRIANGLES) edge indices of the triangles for each case,
+    padded with -1
+"""
+
+import numpy as np
+
+# Corner offsets (i, j, k) of a cube, numbered as in the classical tables
+CORNER_OFFSETS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+], dtype=np.int64)
+
+# Cube edges as (lower corner, upper corner)
+EDGE_CORNERS = np.array([
+    (0, 1), (1, 2), (3, 2), (0, 3),
+    (4, 5), (5, 6), (7, 6), (4, 7),
+    (0, 4), (1, 5), (2, 6), (3, 7),
+], dtype=np.int64)
+
+EDGE_AXIS = np.argmax(
+    CORNER_OFFSETS[EDGE_CORNERS[:, 1]] - CORNER_OFFSETS[EDGE_CORNERS[:, 0]], axis=1
+)
+
+
+def _face_cycles():
+    """Return the corners of each cube face, counter-clockwise seen from outside."""
+    cycles = []
+    for axis in range(3):
+        b, c = (axis + 1) % 3, (axis + 2) % 3
+        for side in (0, 1):
+            corners = [n for n in range(8) if CORNER_OFFSETS[n, axis] == side]
+            angles = [np.arctan2(CORNER_OFFSETS[n, c] - 0.5, CORNER_OFFSETS[n, b] - 0.5)
+                      for n in corners]
+            cycle = [corners[n] for n in np.argsort(angles)]
+            cycles.append(cycle if side == 1 else cycle[::-1])
+    return cycles
+
+
+def _edge_index(u, v):
+    """Return the index of the cube edge joining corners `u` and `v`."""
+    for e, (a, b) in enumerate(EDGE_CORNERS):
+        if (a, b) in ((u, v), (v, u)):
+            return e
+    raise ValueError(f"corners {u} and {v} are not joined by an edge")
+
+
+def _case_polygons(case):
+    """Trace the closed polygons of the surface for one cube case."""
+    inside = [(case >> n) & 1 for n in range(8)]
+
+    # On each face, walk the corners and join every entry into a run of
+    # inside corners to the exit from that run
+    successor = {}
+    for cycle in _face_cycles():
+        crossings = []
+        for p in range(4):
+            u, v = cycle[p], cycle[(p + 1) % 4]
+            if inside[u] != inside[v]:
+                crossings.append((_edge_index(u, v), bool(inside[v])))
+        if not crossings:
+            continue
+        # Rotate so the walk starts on an entry, then pair entries with exits
+        start = next(n for n, (_, entry) in enumerate(crossings) if entry)
+        crossings = crossings[start:] + crossings[:start]
+        for n in range(0, len(crossings), 2):
+            successor[crossings[n][0]] = crossings[n + 1][0]
+
+    # Chain the segments into polygons
+    polygons = []
+    while successor:
+        edge, polygon = next(iter(successor)), []
+        while edge in successor:
+            polygon.append(edge)
+            edge = successor.pop(edge)
+        polygons.append(polygon)
+    return polygons
+
+
+def _build_tables():
+    """Build the edge and triangle tables for all 256 cases."""
+    edge_table = np.zeros(256, dtype=np.int64)
+    triangles = []
+    for case in range(256):
+        tris = []
+        for polygon in _case_polygons(case):
+            for edge in polygon:
+                edge_table[case] |= 1 << edge
+            # Fan triangulation; the polygons run counter-clockwise seen from
+            # the inside region, so normals point away from it
+            for n in range(1, len(polygon) - 1):
+                tris.append((polygon[0], polygon[n], polygon[n + 1]))
+        triangles.append(tris)
+
+    max_triangles = max(len(tris) for tris in triangles)
+    tri_count = np.array([len(tris) for tris in triangles], dtype=np.int64)
+    tri_table = np.full((256, 3 * max_triangles), -1, dtype=np.int64)
+    for case, tris in enumerate(triangles):
+        tri_table[case, :3 * len(tris)] = np.ravel(tris)
+    return edge_table, tri_count, tri_table
+
+
+EDGE_TABLE, TRI_COUNT, TRI_TABLE = _build_tables()
+MAX_TRIANGLES = TRI_TABLE.shape[1] // 3
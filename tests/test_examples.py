@@ -0,0 +1,35 @@
+"""
+Smoke Tests for the Example Scripts
+Created by Jaime Estela | https://github.com/Jaimeestela | studio@jaimeestela.com
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'examples')
+
+
+class TestBatchExport:
+    """Test cases for the batch export example."""
+    
+    def test_runs_and_exits(self, tmp_path):
+        """Test that the worker pool finishes and the script exits cleanly."""
+        result = subprocess.run(
+            [sys.executable, os.path.join(EXAMPLES_DIR, 'batch_export.py')],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            timeout=600
+        )
+        
+        assert result.returncode == 0, result.stderr
+        assert "Batch export completed successfully" in result.stdout
+        assert len(list(tmp_path.glob('*.stl'))) == 9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -5,6 +5,7 @@ Created by Jaime Estela | https://github.com/Jaimeestela | studio@jaimeestela.co
 
 import pytest
 import numpy as np
+from core import fields
 from core.fields import ScalarField
 
 
@@ -45,6 +46,39 @@ class TestScalarFieldBase:
         # With offset, (0,0,0) becomes (1,1,1) -> 3
         assert field(0.0, 0.0, 0.0) == 3.0
     
+    def test_cache_key(self):
+        """Test that the cache key tracks the field parameters."""
+        field = TestScalarField(scale=2.0, offset=(1.0, 0.0, 0.0))
+        key = field._cache_key()
+        
+        assert key == TestScalarField(scale=2.0, offset=(1.0, 0.0, 0.0))._cache_key()
+        assert key != TestScalarField(scale=3.0, offset=(1.0, 0.0, 0.0))._cache_key()
+        assert key != TestScalarField(scale=2.0, offset=(0.0, 0.0, 0.0))._cache_key()
+        
+        field.extra = []
+        assert field._cache_key() is None
+        
+        # Objects that hash by identity could change without changing the key
+        field.extra = lambda x: x
+        assert field._cache_key() is None
+        field.extra = object()
+        assert field._cache_key() is None
+    
+    def test_composed_cache_key(self):
+        """Test that a composed field's key follows its inner field's parameters."""
+        inner = TestScalarField(scale=2.0)
+        outer = TestScalarField()
+        outer.inner = inner
+        outer.shift = (0.5, np.float32(1.0))
+        key = outer._cache_key()
+        
+        assert key is not None
+        inner.scale = 3.0
+        assert outer._cache_key() != key
+        
+        inner.extra = []
+        assert outer._cache_key() is None
+    
     def test_grid_evaluation(self):
         """Test grid evaluation."""
         field = TestScalarField()
@@ -58,6 +92,94 @@ class TestScalarFieldBase:
         assert coords.shape == (125, 3)  # 5^3 = 125
         assert values.shape == (125,)
         assert len(coords) == len(values)
+    
+    def test_grid_axes_built_once(self, monkeypatch):
+        """Test that grid evaluation shares one set of axes between values and coordinates."""
+        calls = []
+        grid_axes = fields._grid_axes
+        
+        def counting(*args):
+            calls.append(args)
+            return grid_axes(*args)
+        
+        monkeypatch.setattr(fields, '_grid_axes', counting)
+        coords, values = TestScalarField().evaluate_grid((-1.0, 1.0), (0.0, 2.0), (-3.0, 1.0), 4)
+        
+        assert len(calls) == 1
+        np.testing.assert_array_almost_equal(values, coords.sum(axis=1))
+    
+    def test_grid_values_only(self):
+        """Test value-only grid evaluation."""
+        field = TestScalarField()
+        ranges = ((-1.0, 1.0), (0.0, 2.0), (-3.0, 1.0))
+        
+        volume = field.evaluate_grid_values(*ranges, resolution=5)
+        _, values = field.evaluate_grid(*ranges, resolution=5)
+        
+        assert volume.shape == (5, 5, 5)
+        assert volume.flags['C_CONTIGUOUS']
+        assert volume.dtype == np.float32
+        np.testing.assert_array_almost_equal(volume.ravel(), values)
+    
+    def test_grid_values_match_coordinates(self):
+        """Test that grid values line up with their coordinates."""
+        field = TestScalarField(scale=2.0, offset=(0.5, -1.0, 0.0))
+        coords, values = field.evaluate_grid(
+            x_range=(-1.0, 1.0),
+            y_range=(0.0, 2.0),
+            z_range=(-3.0, 1.0),
+            resolution=4
+        )
+        
+        expected = field(coords[:, 0], coords[:, 1], coords[:, 2])
+        np.testing.assert_array_almost_equal(values, expected)
+    
+    def test_blocked_grid_evaluation(self, monkeypatch):
+        """Test that block-wise grid evaluation covers the whole volume."""
+        field = TestScalarField()
+        x = np.linspace(-1.0, 1.0, 7)
+        y = np.linspace(0.0, 3.0, 9)
+        z = np.linspace(2.0, 5.0, 5)
+        
+        # Force blocks much smaller than the grid
+        monkeypatch.setattr(fields, '_BLOCK_BYTES', 256)
+        values = field.evaluate_separable(x, y, z)
+        
+        expected = x[:, None, None] + y[None, :, None] + z[None, None, :]
+        np.testing.assert_array_almost_equal(values, expected)
+    
+    def test_grid_device(self):
+        """Test device selection for grid evaluation."""
+        field = TestScalarField()
+        ranges = ((-1.0, 1.0), (-1.0, 1.0), (-1.0, 1.0))
+        
+        _, values_cpu = field.evaluate_grid(*ranges, resolution=3, device='cpu')
+        _, values_auto = field.evaluate_grid(*ranges, resolution=3, device='auto')
+        
+        # 'auto' always hands results back as host arrays
+        assert isinstance(values_auto, np.ndarray)
+        np.testing.assert_array_almost_equal(values_auto, values_cpu)
+        
+        with pytest.raises(ValueError):
+            field.evaluate_grid(*ranges, resolution=3, device='tpu')
+    
+    def test_grid_dtype(self):
+        """Test that grids are evaluated in the field's dtype."""
+        ranges = ((-1.0, 1.0), (-1.0, 1.0), (-1.0, 1.0))
+        
+        _, values32 = TestScalarField().evaluate_grid(*ranges, resolution=3)
+        _, values64 = TestScalarField(dtype=np.float64).evaluate_grid(*ranges, resolution=3)
+        
+        assert values32.dtype == np.float32
+        assert values64.dtype == np.float64
+    
+    def test_point_precision(self):
+        """Test that point evaluation keeps the precision of its inputs."""
+        field = TestScalarField(offset=(0.1, 0.0, 0.0))
+        
+        assert np.asarray(field(1.0, 2.0, 3.0)).dtype == np.float64
+        assert field(1.0, 2.0, 3.0) == 1.1 + 2.0 + 3.0
+        assert field(np.ones(2, dtype=np.float32), 1.0, 1.0).dtype == np.float32
 
 
 if __name__ == "__main__":
@@ -6,8 +6,11 @@ Created by Jaime Estela | https://github.com/Jaimeestela | studio@jaimeestela.co
 import pytest
 import numpy as np
 import trimesh
-from core.tpms import Gyroid
-from geometry.marching_cubes import generate_mesh
+from core.fields import ScalarField
+from core.tpms import Gyroid, SchwarzP
+from geometry import mc_jit, marching_cubes
+from geometry.marching_cubes import generate_mesh, _active_blocks, _marching_cubes_simple
+from geometry.mc_tables import EDGE_TABLE, TRI_COUNT, TRI_TABLE
 from geometry.industrial import (
     calculate_volume,
     calculate_bounding_box,
@@ -17,6 +20,36 @@ from geometry.industrial import (
 )
 
 
+class Shifted(ScalarField):
+    """Field composed of another field plus a constant."""
+    
+    def __init__(self, inner, shift):
+        super().__init__()
+        self.inner = inner
+        self.shift = shift
+    
+    def evaluate(self, x, y, z):
+        return self.inner(x, y, z) + self.shift
+    
+    def evaluate_separable(self, x, y, z):
+        return self.inner.evaluate_separable(x, y, z) + self.shift
+
+
+@pytest.fixture
+def grid_samples(monkeypatch):
+    """Record every Gyroid grid evaluation, starting from an empty grid cache."""
+    calls = []
+    evaluate_grid_values = Gyroid.evaluate_grid_values
+    
+    def counting(self, *args, **kwargs):
+        calls.append(args)
+        return evaluate_grid_values(self, *args, **kwargs)
+    
+    monkeypatch.setattr(Gyroid, 'evaluate_grid_values', counting)
+    generate_mesh.cache_clear()
+    return calls
+
+
 class TestMarchingCubes:
     """Test cases for mesh generation."""
     
@@ -60,6 +93,197 @@ class TestMarchingCubes:
         # (though they might have similar structure)
         assert isinstance(mesh1, trimesh.Trimesh)
         assert isinstance(mesh2, trimesh.Trimesh)
+    
+    @pytest.mark.parametrize("backend", ["kernel", "skimage", "numpy"])
+    def test_mesh_is_compact_without_cleanup(self, backend, monkeypatch):
+        """Test that the output of every extraction path needs no cleanup passes."""
+        if backend == "kernel" and not mc_jit.NUMBA_AVAILABLE:
+            pytest.skip("Numba not installed")
+        if backend == "skimage" and marching_cubes._sk_mc is None:
+            pytest.skip("scikit-image not installed")
+        if backend != "kernel":
+            monkeypatch.setattr(mc_jit, 'NUMBA_AVAILABLE', False)
+        if backend == "numpy":
+            monkeypatch.setattr(marching_cubes, '_sk_mc', None)
+        gyroid = Gyroid(scale=1.0, thickness=0.3)
+        
+        mesh = generate_mesh(gyroid, resolution=30)
+        cleaned = generate_mesh(gyroid, resolution=30, clean=True)
+        
+        assert len(mesh.faces) > 0
+        assert len(mesh.vertices) == len(cleaned.vertices)
+        assert len(mesh.faces) == len(cleaned.faces)
+        assert len(np.unique(mesh.faces)) == len(mesh.vertices)
+    
+    def test_grid_cache(self, grid_samples):
+        """Test that iso-value sweeps reuse the sampled grid."""
+        generate_mesh(Gyroid(scale=1.0), resolution=20, iso_value=0.0)
+        generate_mesh(Gyroid(scale=1.0), resolution=20, iso_value=0.5)
+        assert len(grid_samples) == 1
+        
+        generate_mesh(Gyroid(scale=1.0, thickness=0.2), resolution=20)
+        generate_mesh(Gyroid(scale=1.0), resolution=25)
+        assert len(grid_samples) == 3
+        
+        generate_mesh.cache_clear()
+        generate_mesh(Gyroid(scale=1.0), resolution=20)
+        assert len(grid_samples) == 4
+    
+    def test_grid_cache_composed_field(self):
+        """Test that mutating the inner field of a composed field misses the grid cache."""
+        generate_mesh.cache_clear()
+        gyroid = Gyroid(scale=1.0)
+        field = Shifted(gyroid, 0.0)
+        
+        area = generate_mesh(field, resolution=30).area
+        gyroid.thickness = 0.5
+        thick_area = generate_mesh(field, resolution=30).area
+        
+        assert thick_area != area
+        generate_mesh.cache_clear()
+        np.testing.assert_allclose(generate_mesh(field, resolution=30).area, thick_area)
+    
+    def test_grid_resampling(self, grid_samples):
+        """Test that covered sub-regions are resampled from a cached grid on request."""
+        gyroid = Gyroid(scale=1.0, dtype=np.float64)
+        zoom = ((-2.0, 2.0), (-1.0, 3.0), (0.0, 4.0))
+        
+        generate_mesh(gyroid, resolution=60)
+        mesh = generate_mesh(gyroid, resolution=30, bounds=zoom, resample=True)
+        assert len(grid_samples) == 1
+        
+        exact = generate_mesh(gyroid, resolution=30, bounds=zoom)
+        assert len(grid_samples) == 2
+        np.testing.assert_allclose(mesh.area, exact.area, rtol=1e-2)
+        np.testing.assert_allclose(mesh.bounds, exact.bounds, atol=0.05)
+        
+        # Regions outside every cached grid are sampled exactly
+        generate_mesh(gyroid, resolution=30, bounds=((0.0, 6.0),) * 3, resample=True)
+        assert len(grid_samples) == 3
+    
+    def test_grid_dtype(self):
+        """Test that the grid precision barely changes the extracted surface."""
+        gyroid = Gyroid(scale=1.0, dtype=np.float64)
+        
+        mesh32 = generate_mesh(gyroid, resolution=30, dtype=np.float32)
+        mesh64 = generate_mesh(gyroid, resolution=30)
+        
+        assert len(mesh32.faces) == len(mesh64.faces)
+        np.testing.assert_allclose(mesh32.area, mesh64.area, rtol=1e-4)
+    
+    def test_sampling_avoids_pointwise_evaluation(self, monkeypatch):
+        """Test that TPMS grids are sampled from axis tables, not coordinate grids."""
+        def fail(self, x, y, z):
+            raise AssertionError("pointwise evaluation on a coordinate grid")
+        
+        generate_mesh.cache_clear()
+        for field_class in (Gyroid, SchwarzP):
+            monkeypatch.setattr(field_class, '__call__', fail)
+            monkeypatch.setattr(field_class, 'evaluate', fail)
+            mesh = generate_mesh(field_class(scale=1.0), resolution=20)
+            assert len(mesh.faces) > 0
+    
+    def test_active_blocks(self):
+        """Test that block flags match the value range of each block with its halo."""
+        rng = np.random.default_rng(0)
+        values = rng.standard_normal((11, 9, 6))
+        active = _active_blocks(values < 0.5, block=4)
+        
+        assert active.shape == (3, 2, 2)
+        for i, j, k in np.ndindex(active.shape):
+            block = values[4 * i:4 * i + 5, 4 * j:4 * j + 5, 4 * k:4 * k + 5]
+            assert active[i, j, k] == (block.min() < 0.5 <= block.max())
+    
+    def test_lookup_tables(self):
+        """Test that the triangle table only uses edges crossed by the surface."""
+        assert TRI_COUNT[0] == 0
+        assert TRI_COUNT[255] == 0
+        
+        for case in range(256):
+            edges = TRI_TABLE[case, :3 * TRI_COUNT[case]]
+            assert np.all(edges >= 0)
+            assert np.all(TRI_TABLE[case, 3 * TRI_COUNT[case]:] == -1)
+            assert all((EDGE_TABLE[case] >> edge) & 1 for edge in edges)
+    
+    def test_numpy_fallback_closed_surface(self):
+        """Test that the NumPy fallback extracts a closed, outward-facing sphere."""
+        axis = np.linspace(-1.0, 1.0, 30)
+        X, Y, Z = np.meshgrid(axis, axis, axis, indexing='ij')
+        volume = X**2 + Y**2 + Z**2 - 0.5
+        
+        spacing = (axis[1] - axis[0],) * 3
+        mesh = _marching_cubes_simple(volume, 0.0, ((-1.0, 1.0),) * 3, spacing)
+        
+        assert mesh.is_watertight
+        assert mesh.is_winding_consistent
+        expected = 4.0 / 3.0 * np.pi * 0.5**1.5
+        assert abs(mesh.volume - expected) / expected < 0.02
+    
+    def test_numpy_fallback_without_surface(self, monkeypatch):
+        """Test that the NumPy fallback returns an empty mesh when no cube crosses the level."""
+        mesh = _marching_cubes_simple(np.ones((10, 10, 10)), 0.0, ((0.0, 1.0),) * 3,
+                                      (1.0 / 9,) * 3)
+        assert len(mesh.vertices) == 0
+        assert len(mesh.faces) == 0
+        
+        # Same through generate_mesh with Numba and scikit-image unavailable
+        monkeypatch.setattr(mc_jit, 'NUMBA_AVAILABLE', False)
+        monkeypatch.setattr(marching_cubes, '_sk_mc', None)
+        mesh = generate_mesh(Gyroid(scale=1.0), resolution=10, iso_value=5.0)
+        assert len(mesh.faces) == 0
+    
+    @pytest.mark.skipif(not mc_jit.NUMBA_AVAILABLE, reason="Numba not installed")
+    def test_compiled_kernel_closed_surface(self):
+        """Test that the compiled kernel extracts a closed, outward-facing sphere."""
+        axis = np.linspace(-1.0, 1.0, 40)
+        X, Y, Z = np.meshgrid(axis, axis, axis, indexing='ij')
+        volume = (X**2 + Y**2 + Z**2 - 0.5).astype(np.float32)
+        
+        spacing = np.full(3, axis[1] - axis[0])
+        vertices, faces = mc_jit.mc_extract(volume, 0.0, spacing, np.full(3, -1.0))
+        mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+        
+        assert mesh.is_watertight
+        assert mesh.is_winding_consistent
+        expected = 4.0 / 3.0 * np.pi * 0.5**1.5
+        assert abs(mesh.volume - expected) / expected < 0.01
+    
+    @pytest.mark.skipif(not mc_jit.NUMBA_AVAILABLE, reason="Numba not installed")
+    def test_compiled_kernel_slabs(self):
+        """Test that slabs extracted on separate threads stitch into one surface."""
+        axis = np.linspace(-1.0, 1.0, 60)
+        X, Y, Z = np.meshgrid(axis, axis, axis, indexing='ij')
+        volume = X**2 + Y**2 + Z**2 - 0.5
+        spacing = np.full(3, axis[1] - axis[0])
+        
+        vertices, faces = mc_jit.mc_extract(volume, 0.0, spacing, np.full(3, -1.0), workers=1)
+        slab_vertices, slab_faces = mc_jit.mc_extract(volume, 0.0, spacing, np.full(3, -1.0),
+                                                      workers=3)
+        mesh = trimesh.Trimesh(vertices=slab_vertices, faces=slab_faces, process=False)
+        
+        assert len(slab_vertices) == len(vertices)
+        assert len(slab_faces) == len(faces)
+        assert mesh.is_watertight
+        assert mesh.is_winding_consistent
+    
+    @pytest.mark.skipif(not mc_jit.NUMBA_AVAILABLE, reason="Numba not installed")
+    def test_compiled_kernel_matches_skimage(self):
+        """Test that the compiled kernel agrees with scikit-image."""
+        measure = pytest.importorskip("skimage.measure")
+        
+        gyroid = Gyroid(scale=1.0, thickness=0.3)
+        volume = gyroid.evaluate_grid_values((-5.0, 5.0), (-5.0, 5.0), (-5.0, 5.0), 40)
+        spacing = np.full(3, 10.0 / 39)
+        
+        vertices, faces = mc_jit.mc_extract(volume, 0.0, spacing, np.full(3, -5.0))
+        sk_vertices, sk_faces, _, _ = measure.marching_cubes(volume, level=0.0,
+                                                             spacing=tuple(spacing))
+        mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
+        sk_mesh = trimesh.Trimesh(vertices=sk_vertices - 5.0, faces=sk_faces)
+        
+        assert len(mesh.faces) == len(sk_mesh.faces)
+        np.testing.assert_allclose(mesh.area, sk_mesh.area, rtol=1e-3)
+        np.testing.assert_allclose(mesh.bounds, sk_mesh.bounds, atol=1e-4)
 
 
 class TestIndustrialAnalysis:
@@ -111,6 +335,14 @@ class TestIndustrialAnalysis:
         assert analysis['volume'] > 0
         assert analysis['surface_area'] > 0
         assert analysis['is_watertight'] == True
+        assert analysis['edge_count'] == len(box.edges)
+    
+    def test_volume_hint(self):
+        """Test that a known is_volume flag is used instead of recomputed."""
+        box = trimesh.creation.box(extents=[2.0, 2.0, 2.0])
+        
+        assert abs(calculate_volume(box, True) - 8.0) < 1e-6
+        assert calculate_volume(box, False) == 0.0
     
     def test_material_usage_estimation(self):
         """Test material usage estimation."""
@@ -41,6 +41,12 @@ class TestGyroid:
         
         # Thick version applies abs() and subtracts thickness
         assert v2 != v1
+        assert abs(v2 - (abs(v1) - 0.5)) < 1e-12
+        
+        # Same transform on the array path
+        x = np.array([0.3, 1.0, 2.5])
+        np.testing.assert_allclose(gyroid_thick.evaluate(x, x, x),
+                                   np.abs(gyroid_thin.evaluate(x, x, x)) - 0.5)
     
     def test_scale_parameter(self):
         """Test scale parameter."""
@@ -63,6 +69,47 @@ class TestGyroid:
         
         values = gyroid(x, y, z)
         assert values.shape == (3,)
+    
+    def test_call_matches_evaluate(self):
+        """Test that the (possibly fused) call path matches evaluate."""
+        gyroid = Gyroid(scale=2.5, thickness=0.3)
+        rng = np.random.default_rng(0)
+        x, y, z = rng.uniform(-5.0, 5.0, size=(3, 4, 5))
+        
+        values = gyroid(x, y, z)
+        expected = gyroid.evaluate(x * 2.5, y * 2.5, z * 2.5)
+        assert values.shape == (4, 5)
+        np.testing.assert_allclose(values, expected, atol=1e-9)
+    
+    def test_scalar_precision(self):
+        """Test that scalar calls are evaluated in double precision."""
+        value = Gyroid(scale=10.0)(1.0, 2.0, 3.0)
+        expected = np.sin(10.0) * np.cos(20.0) + np.sin(20.0) * np.cos(30.0) + \
+            np.sin(30.0) * np.cos(10.0)
+        
+        assert np.asarray(value).dtype == np.float64
+        assert abs(value - expected) < 1e-12
+    
+    def test_float32_inputs(self):
+        """Test that float32 inputs are evaluated in float32."""
+        gyroid = Gyroid(scale=2.0, thickness=0.1)
+        x = np.linspace(-1.0, 1.0, 8, dtype=np.float32)
+        
+        values = gyroid(x, x, x)
+        assert values.dtype == np.float32
+        np.testing.assert_allclose(values, gyroid(x.astype(np.float64), x, x), atol=1e-5)
+    
+    def test_separable_matches_pointwise(self):
+        """Test that the per-axis grid path matches pointwise evaluation."""
+        gyroid = Gyroid(scale=3.0, thickness=0.2)
+        x = np.linspace(-1.0, 1.0, 4)
+        y = np.linspace(0.0, 2.0, 5)
+        z = np.linspace(-2.0, 0.5, 6)
+        
+        values = gyroid.evaluate_separable(x, y, z)
+        X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+        assert values.shape == (4, 5, 6)
+        np.testing.assert_allclose(values, gyroid(X, Y, Z), atol=1e-9)
 
 
 class TestSchwarzP:
@@ -107,6 +154,27 @@ class TestSchwarzP:
         value = schwarz.evaluate(x, y, z)
         # cos(π/2) = 0, so sum = 0
         assert abs(value) < 1e-10
+    
+    def test_call_matches_evaluate(self):
+        """Test that the (possibly fused) call path matches evaluate."""
+        schwarz = SchwarzP(scale=1.5, thickness=0.4)
+        rng = np.random.default_rng(1)
+        x, y, z = rng.uniform(-5.0, 5.0, size=(3, 20))
+        
+        values = schwarz(x, y, z)
+        expected = schwarz.evaluate(x * 1.5, y * 1.5, z * 1.5)
+        np.testing.assert_allclose(values, expected, atol=1e-9)
+    
+    def test_separable_matches_pointwise(self):
+        """Test that the per-axis grid path matches pointwise evaluation."""
+        schwarz = SchwarzP(scale=2.0, thickness=0.5)
+        x = np.linspace(-1.0, 1.0, 4)
+        y = np.linspace(0.0, 2.0, 5)
+        z = np.linspace(-2.0, 0.5, 6)
+        
+        values = schwarz.evaluate_separable(x, y, z)
+        X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+        np.testing.assert_allclose(values, schwarz(X, Y, Z), atol=1e-9)
 
 
 if __name__ == "__main__":